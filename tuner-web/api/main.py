@@ -2,7 +2,7 @@
 FastAPI server for progression tuner web interface
 Real-time evolution monitoring with GPU acceleration
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 import asyncio
@@ -10,13 +10,15 @@ import json
 from datetime import datetime
 from typing import List
 
-from engine.gpu_evolution import GPUEvolutionEngine
+from engine.gpu_evolution import GPUEvolutionEngine, FITNESS_METRICS
+from engine.sensitivity import SensitivityAnalysis
 from monitoring.hardware import HardwareMonitor
 
 app = FastAPI(title="Progression Tuner", version="1.0.0")
 
 # Global state
 evolution_engine = None
+sensitivity_job = None
 hardware_monitor = HardwareMonitor()
 connected_clients: List[WebSocket] = []
 
@@ -95,6 +97,74 @@ async def pause_evolution():
     return {"status": "paused"}
 
 
+@app.post("/api/evolution/strategy/{strategy}")
+async def set_strategy(strategy: str):
+    """Select search strategy (evolution, random_search, nsga2)"""
+    if not evolution_engine:
+        return {"error": "Evolution engine not initialized"}
+    if strategy not in evolution_engine.STRATEGIES:
+        return {"error": f"Unknown strategy '{strategy}'", "strategies": list(evolution_engine.STRATEGIES)}
+    evolution_engine.strategy = strategy
+    return {"strategy": strategy}
+
+
+@app.get("/api/pareto")
+async def get_pareto_front():
+    """Current Pareto front over the per-metric fitness scores"""
+    front = evolution_engine.get_pareto_front() if evolution_engine else []
+    return {
+        "metrics": list(FITNESS_METRICS),
+        "generation": evolution_engine.generation if evolution_engine else 0,
+        "front": front
+    }
+
+
+@app.post("/api/sensitivity/start")
+async def start_sensitivity(method: str = "sobol", samples: int = Query(256, ge=1), threshold: float = 0.05):
+    """Start a sensitivity-analysis job (sobol or morris) against the evolution evaluator"""
+    global sensitivity_job
+    if not evolution_engine:
+        return {"error": "Evolution engine not initialized"}
+    if sensitivity_job and sensitivity_job.running:
+        return {"error": "Sensitivity analysis already running"}
+    if method not in SensitivityAnalysis.METHODS:
+        return {"error": f"Unknown method '{method}'", "methods": list(SensitivityAnalysis.METHODS)}
+
+    # Separate engine so sample evaluations don't pollute the evolution run's stats
+    engine = GPUEvolutionEngine(game_dll=evolution_engine.game_dll, fitness_source=evolution_engine.fitness_source)
+    sensitivity_job = SensitivityAnalysis(engine, method=method, samples=samples, freeze_threshold=threshold)
+    # Keep a reference so the task isn't garbage-collected mid-run
+    sensitivity_job.task = asyncio.create_task(sensitivity_job.run())
+    return {"status": "started", "total_evaluations": sensitivity_job.total_evaluations}
+
+
+@app.get("/api/sensitivity")
+async def get_sensitivity():
+    """Sensitivity job progress and, once finished, indices + freeze recommendation"""
+    if not sensitivity_job:
+        return {"status": "idle"}
+    return {"stats": sensitivity_job.get_stats(), "result": sensitivity_job.result}
+
+
+@app.post("/api/sensitivity/apply")
+async def apply_sensitivity():
+    """Freeze the recommended low-impact parameters in the evolution engine"""
+    if not evolution_engine:
+        return {"error": "Evolution engine not initialized"}
+    if not sensitivity_job or not sensitivity_job.result:
+        return {"error": "No finished sensitivity analysis"}
+    evolution_engine.freeze_parameters(sensitivity_job.result["freeze"])
+    return {"frozen": evolution_engine.frozen_parameters}
+
+
+@app.post("/api/evolution/unfreeze")
+async def unfreeze_parameters():
+    """Let evolution explore all 12 parameters again"""
+    if evolution_engine:
+        evolution_engine.freeze_parameters({})
+    return {"frozen": {}}
+
+
 @app.post("/api/throttle/{percentage}")
 async def set_throttle(percentage: int):
     """Set CPU/GPU throttle (0-100%)"""
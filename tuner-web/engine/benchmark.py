@@ -0,0 +1,312 @@
+"""
+Optimizer comparison benchmark
+- Runs the engine's search strategies under a fixed evaluation or wall-clock budget
+- Synthetic landscapes shaped like the 12-gene framework space
+- Frozen replay of real C# evaluator results (lookup table)
+- Reports evaluations-to-target, best-so-far curves and variance across seeds
+
+Usage (from tuner-web/):
+    python3 -m engine.benchmark --evaluations 2000 --seeds 10
+    python3 -m engine.benchmark --record replay.json --evaluations 5000
+    python3 -m engine.benchmark --landscapes replay:replay.json --seconds 30
+"""
+import argparse
+import asyncio
+import json
+import numpy as np
+from typing import List, Dict, Optional
+
+from engine.gpu_evolution import (
+    GPUEvolutionEngine,
+    FrameworkCandidate,
+    PARAMETER_BOUNDS,
+    FITNESS_METRICS,
+    scalarize_metrics,
+    candidates_to_unit,
+    unit_to_candidates,
+)
+
+
+# ===== Fitness sources =====
+
+class SyntheticLandscape:
+    """Classic test function mapped onto the 12-gene space, fitness on a 0-100 scale"""
+
+    has_metrics = False  # Scalar only - multi-objective strategies are skipped
+
+    def __init__(self, name: str, seed: int = 0, target: float = 90.0):
+        if name not in SYNTHETIC_FUNCTIONS:
+            raise ValueError(f"Unknown landscape '{name}' (choose from {', '.join(SYNTHETIC_FUNCTIONS)})")
+        self.name = name
+        self.target = target
+        self.function = SYNTHETIC_FUNCTIONS[name]
+
+        # Optimum at a random interior point, snapped so integer genes can hit it exactly
+        optimum = np.random.default_rng(seed).uniform(0.2, 0.8, len(PARAMETER_BOUNDS))
+        self.optimum = candidates_to_unit(unit_to_candidates(optimum))[0]
+
+    def __call__(self, candidates: List[FrameworkCandidate]) -> List[float]:
+        offset = candidates_to_unit(candidates) - self.optimum
+        return (100.0 / (1.0 + self.function(offset))).tolist()
+
+
+def _sphere(offset: np.ndarray) -> np.ndarray:
+    """Smooth, unimodal - the easy case"""
+    return np.sum(offset ** 2, axis=1)
+
+
+def _rastrigin(offset: np.ndarray) -> np.ndarray:
+    """Highly multimodal - punishes greedy local search"""
+    z = offset * 5.12
+    return 0.01 * (10.0 * z.shape[1] + np.sum(z ** 2 - 10.0 * np.cos(2.0 * np.pi * z), axis=1))
+
+
+def _rosenbrock(offset: np.ndarray) -> np.ndarray:
+    """Narrow curved valley - coupled genes, like enemy HP vs player damage"""
+    z = offset * 2.0 + 1.0
+    return 0.01 * np.sum(100.0 * (z[:, 1:] - z[:, :-1] ** 2) ** 2 + (1.0 - z[:, :-1]) ** 2, axis=1)
+
+
+SYNTHETIC_FUNCTIONS = {
+    "sphere": _sphere,
+    "rastrigin": _rastrigin,
+    "rosenbrock": _rosenbrock,
+}
+
+
+class LookupTableFitness:
+    """Frozen replay of real evaluator results
+
+    Exact matches return the recorded fitness; anything else gets the
+    fitness of the nearest recorded candidate (in normalized gene space).
+    Tables recorded with per-metric scores replay those too.
+    """
+
+    # Cap on query x table distance entries held at once (~32 MB of float64)
+    MAX_DISTANCE_ENTRIES = 4_000_000
+
+    def __init__(self, records: List[Dict], target: Optional[float] = None, name: str = "replay"):
+        if not records:
+            raise ValueError("Replay table is empty")
+        self.name = name
+        self.points = candidates_to_unit([FrameworkCandidate(**r["candidate"]) for r in records])
+        self.point_norms = np.sum(self.points ** 2, axis=1)
+        self.fitnesses = np.array([r["fitness"] for r in records], dtype=float)
+        self.has_metrics = all("metrics" in r for r in records)
+        self.metrics = [r["metrics"] for r in records] if self.has_metrics else None
+        # Default target: top 5% of what the real evaluator ever produced
+        self.target = target if target is not None else float(np.quantile(self.fitnesses, 0.95))
+
+    @classmethod
+    def load(cls, path: str, target: Optional[float] = None) -> "LookupTableFitness":
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), target=target, name=f"replay:{path}")
+
+    def __call__(self, candidates: List[FrameworkCandidate]) -> List:
+        nearest = self.nearest(candidates_to_unit(candidates))
+        if self.has_metrics:
+            return [self.metrics[i] for i in nearest]
+        return self.fitnesses[nearest].tolist()
+
+
+    def nearest(self, query: np.ndarray) -> np.ndarray:
+        """Index of the closest recorded point per query row, in memory-bounded chunks"""
+        # |q - p|^2 = |q|^2 - 2 q.p + |p|^2 avoids a (queries, records, 12) tensor
+        rows = max(1, self.MAX_DISTANCE_ENTRIES // len(self.points))
+        nearest = np.empty(len(query), dtype=int)
+        for start in range(0, len(query), rows):
+            chunk = query[start:start + rows]
+            distances = np.sum(chunk ** 2, axis=1)[:, None] - 2.0 * chunk @ self.points.T + self.point_norms[None, :]
+            nearest[start:start + rows] = np.argmin(distances, axis=1)
+        return nearest
+
+
+class RecordingFitnessSource:
+    """Wraps a (sync or async) fitness source and keeps every result for replay"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.records = []
+
+    async def __call__(self, candidates: List[FrameworkCandidate]) -> List:
+        results = self.inner(candidates)
+        if asyncio.iscoroutine(results):
+            results = await results
+        for candidate, result in zip(candidates, results):
+            record = {"candidate": vars(candidate).copy()}
+            if isinstance(result, dict):
+                record["metrics"] = {name: float(result[name]) for name in FITNESS_METRICS}
+                record["fitness"] = float(scalarize_metrics(np.array([list(record["metrics"].values())]))[0])
+            else:
+                record["fitness"] = float(result)
+            self.records.append(record)
+        return list(results)
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=2)
+
+
+# ===== Benchmark runner =====
+
+def evaluations_to_target(history: np.ndarray, target: float) -> Optional[int]:
+    """First evaluation count at which best-so-far reached target (None = never)"""
+    hits = np.nonzero(history[:, 2] >= target)[0]
+    return int(history[hits[0], 0]) if len(hits) else None
+
+
+def best_so_far_curve(history: np.ndarray, grid: np.ndarray, axis: int) -> np.ndarray:
+    """Sample the step-shaped best-so-far curve on a grid (NaN before first evaluation)"""
+    index = np.searchsorted(history[:, axis], grid, side='right') - 1
+    curve = history[np.clip(index, 0, None), 2]
+    curve[index < 0] = np.nan
+    return curve
+
+
+def summarize_curves(curves: np.ndarray):
+    """Mean / std across seeds per grid point; None where no seed had evaluated yet"""
+    mean = [None] * curves.shape[1]
+    std = [None] * curves.shape[1]
+    for column in np.nonzero(~np.isnan(curves).all(axis=0))[0]:
+        mean[column] = float(np.nanmean(curves[:, column]))
+        std[column] = float(np.nanstd(curves[:, column]))
+    return mean, std
+
+
+async def run_single(strategy: str, source, seed: int, max_evaluations=None,
+                     max_seconds=None, population_size: int = 20) -> np.ndarray:
+    """One strategy / source / seed run, returns history as (evaluations, seconds, best) rows"""
+    engine = GPUEvolutionEngine(fitness_source=source, seed=seed)
+    engine.strategy = strategy
+    engine.population_size = population_size
+    engine.verbose = False
+    engine.generation_delay = 0.0  # Don't let the UI breather skew wall-clock budgets
+    await engine.start(max_evaluations=max_evaluations, max_seconds=max_seconds)
+    return np.array(engine.history, dtype=float).reshape(-1, 3)
+
+
+async def run_benchmark(strategies: List[str], sources: List, seeds: List[int],
+                        max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None,
+                        population_size: int = 20, curve_points: int = 20) -> Dict:
+    """Run every strategy on every source for every seed and summarize"""
+    if max_evaluations is None and max_seconds is None:
+        raise ValueError("Need an evaluation or wall-clock budget")
+
+    # Curves are sampled on the budget axis: evaluations if given, else seconds
+    axis = 0 if max_evaluations is not None else 1
+    grid = np.linspace(0, max_evaluations if axis == 0 else max_seconds, curve_points + 1)[1:]
+
+    results = {"budget": {"evaluations": max_evaluations, "seconds": max_seconds},
+               "curve_axis": "evaluations" if axis == 0 else "seconds",
+               "curve_grid": grid.tolist(),
+               "seeds": list(seeds),
+               "sources": {}}
+
+    for source in sources:
+        per_strategy = {}
+        for strategy in strategies:
+            if strategy in GPUEvolutionEngine.MULTI_OBJECTIVE_STRATEGIES and not source.has_metrics:
+                per_strategy[strategy] = {"skipped": "source has no per-metric scores"}
+                continue
+
+            to_target, final_best, curves = [], [], []
+            for seed in seeds:
+                history = await run_single(strategy, source, seed, max_evaluations,
+                                           max_seconds, population_size)
+                to_target.append(evaluations_to_target(history, source.target))
+                final_best.append(float(history[-1, 2]))
+                curves.append(best_so_far_curve(history, grid, axis))
+
+            reached = np.array([e for e in to_target if e is not None], dtype=float)
+            curve_mean, curve_std = summarize_curves(np.array(curves))
+            per_strategy[strategy] = {
+                "success_rate": len(reached) / len(seeds),
+                "evals_to_target_median": float(np.median(reached)) if len(reached) else None,
+                "evals_to_target_mean": float(np.mean(reached)) if len(reached) else None,
+                "evals_to_target_std": float(np.std(reached)) if len(reached) else None,
+                "final_best_mean": float(np.mean(final_best)),
+                "final_best_std": float(np.std(final_best)),
+                "curve_mean": curve_mean,
+                "curve_std": curve_std,
+                "per_seed_evals_to_target": to_target,
+            }
+        results["sources"][source.name] = {"target": source.target, "strategies": per_strategy}
+    return results
+
+
+def print_report(results: Dict):
+    for source_name, source_result in results["sources"].items():
+        print(f"\n📊 {source_name} (target fitness {source_result['target']:.2f})")
+        print(f"   {'strategy':<16}{'hit rate':>10}{'evals→target':>16}{'± std':>10}{'final best':>14}{'± std':>8}")
+        for strategy, r in source_result["strategies"].items():
+            if "skipped" in r:
+                print(f"   {strategy:<16}(skipped: {r['skipped']})")
+                continue
+            median = f"{r['evals_to_target_median']:.0f}" if r['evals_to_target_median'] is not None else "-"
+            std = f"{r['evals_to_target_std']:.0f}" if r['evals_to_target_std'] is not None else "-"
+            print(f"   {strategy:<16}{r['success_rate']:>10.0%}{median:>16}{std:>10}"
+                  f"{r['final_best_mean']:>14.2f}{r['final_best_std']:>8.2f}")
+
+
+async def record_replay_table(path: str, max_evaluations: Optional[int] = None,
+                              max_seconds: Optional[float] = None):
+    """Run the engine against the real C# evaluator and freeze every result to a replay table"""
+    engine = GPUEvolutionEngine()
+    recorder = RecordingFitnessSource(engine.evaluate_with_game)
+    engine.fitness_source = recorder
+    await engine.start(max_evaluations=max_evaluations, max_seconds=max_seconds)
+    recorder.save(path)
+    print(f"💾 Recorded {len(recorder.records)} evaluations to {path}")
+
+
+def build_sources(names: List[str], target: Optional[float]) -> List:
+    sources = []
+    for name in names:
+        if name.startswith("replay:"):
+            sources.append(LookupTableFitness.load(name[len("replay:"):], target=target))
+        else:
+            sources.append(SyntheticLandscape(name, target=target if target is not None else 90.0))
+    return sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare search strategies on fixed budgets")
+    parser.add_argument("--strategies", default=",".join(GPUEvolutionEngine.STRATEGIES),
+                        help=f"Comma-separated ({', '.join(GPUEvolutionEngine.STRATEGIES)})")
+    parser.add_argument("--landscapes", default=",".join(SYNTHETIC_FUNCTIONS),
+                        help="Comma-separated synthetic names and/or replay:<table.json>")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of seeds per strategy")
+    parser.add_argument("--evaluations", type=int, default=None, help="Evaluation budget per run")
+    parser.add_argument("--seconds", type=float, default=None, help="Wall-clock budget per run")
+    parser.add_argument("--population", type=int, default=20, help="Population / batch size")
+    parser.add_argument("--target", type=float, default=None, help="Target fitness (overrides defaults)")
+    parser.add_argument("--output", default=None, help="Write full results (incl. curves) as JSON")
+    parser.add_argument("--record", default=None,
+                        help="Record a replay table from the real evaluator to this path instead")
+    args = parser.parse_args()
+
+    if args.evaluations is None and args.seconds is None:
+        args.evaluations = 2000
+
+    if args.record:
+        asyncio.run(record_replay_table(args.record, args.evaluations, args.seconds))
+        return
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in strategies if s not in GPUEvolutionEngine.STRATEGIES]
+    if unknown:
+        parser.error(f"Unknown strategies: {', '.join(unknown)}")
+
+    sources = build_sources([n.strip() for n in args.landscapes.split(",") if n.strip()], args.target)
+    results = asyncio.run(run_benchmark(strategies, sources, list(range(args.seeds)),
+                                        args.evaluations, args.seconds, args.population))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Full results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,65 @@ import torch
 import asyncio
 import subprocess
 import json
+import random
+import time
 import numpy as np
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import dataclass, replace
+from typing import List, Dict, Callable, Optional, Tuple
 from pathlib import Path
 import multiprocessing as mp
 
+from engine.nsga2 import non_dominated_sort, rank_and_crowding, survivor_order
+
+
+# Gene bounds used for random generation and mutation clamping
+# name -> (min, max, is_integer)
+PARAMETER_BOUNDS = {
+    "base_hp": (15, 40, True),
+    "hp_per_level": (1.0, 5.0, False),
+    "base_str": (2, 5, True),
+    "base_def": (0, 3, True),
+    "stat_points_per_level": (1, 3, True),
+    "enemy_base_hp": (3, 12, True),
+    "enemy_hp_scaling": (0.5, 3.0, False),
+    "enemy_base_damage": (1, 5, True),
+    "enemy_damage_scaling": (0.1, 1.0, False),
+    "base_gold": (8, 20, True),
+    "gold_scaling": (2.0, 6.0, False),
+    "equipment_drop_rate": (10.0, 40.0, False),
+}
+
+# Max mutation step per gene (integer genes step by whole numbers)
+MUTATION_STEPS = {
+    "base_hp": 2,
+    "hp_per_level": 0.5,
+    "base_str": 1,
+    "base_def": 1,
+    "stat_points_per_level": 1,
+    "enemy_base_hp": 1,
+    "enemy_hp_scaling": 0.2,
+    "enemy_base_damage": 1,
+    "enemy_damage_scaling": 0.1,
+    "base_gold": 1,
+    "gold_scaling": 0.3,
+    "equipment_drop_rate": 2.0,
+}
+
+# Per-metric fitness components (0-100 each) and their scalar weights,
+# mirroring the C# IFitnessMetric weights
+FITNESS_METRICS = {
+    "combat_balance": 0.25,
+    "economic_health": 0.25,
+    "equipment_curve": 0.10,
+    "difficulty_pacing": 0.10,
+    "build_diversity": 0.15,
+}
+
+# Fitness source: takes a batch of candidates, returns one result per candidate
+# (may be sync or async). A result is either a scalar fitness or a
+# {metric: score} dict over FITNESS_METRICS - NSGA-II needs the dict form.
+FitnessSource = Callable[[List["FrameworkCandidate"]], List[float]]
+
 
 @dataclass
 class FrameworkCandidate:
@@ -58,77 +111,117 @@ class FrameworkCandidate:
         }
 
 
+def scalarize_metrics(metrics: np.ndarray) -> np.ndarray:
+    """Collapse (n, len(FITNESS_METRICS)) metric scores to weighted scalar fitness"""
+    weights = np.array(list(FITNESS_METRICS.values()))
+    return metrics @ weights / weights.sum()
+
+
+def candidates_to_unit(candidates: List[FrameworkCandidate]) -> np.ndarray:
+    """Encode candidates as an (n, 12) array scaled to [0, 1] per PARAMETER_BOUNDS"""
+    low = np.array([b[0] for b in PARAMETER_BOUNDS.values()], dtype=float)
+    high = np.array([b[1] for b in PARAMETER_BOUNDS.values()], dtype=float)
+    raw = np.array([[getattr(c, name) for name in PARAMETER_BOUNDS] for c in candidates], dtype=float)
+    return (raw.reshape(-1, len(PARAMETER_BOUNDS)) - low) / (high - low)
+
+
+def unit_to_candidates(unit: np.ndarray) -> List[FrameworkCandidate]:
+    """Decode an (n, 12) [0, 1] array back to candidates (integer genes rounded)"""
+    candidates = []
+    for row in np.clip(np.atleast_2d(unit), 0.0, 1.0):
+        genes = {}
+        for value, (name, (low, high, is_int)) in zip(row, PARAMETER_BOUNDS.items()):
+            gene = low + value * (high - low)
+            genes[name] = int(round(gene)) if is_int else float(gene)
+        candidates.append(FrameworkCandidate(**genes))
+    return candidates
+
+
 class GPUEvolutionEngine:
     """Hybrid evolution: GPU for mutations, C# for fitness"""
     
-    def __init__(self, game_dll="../ProjectEvolution.Game/bin/Release/net9.0/ProjectEvolution.Game.dll"):
+    def __init__(self, game_dll="../ProjectEvolution.Game/bin/Release/net9.0/ProjectEvolution.Game.dll",
+                 fitness_source: Optional[FitnessSource] = None, seed: Optional[int] = None):
         self.game_dll = Path(game_dll)
+        self.fitness_source = fitness_source  # None = real C# game
+        self.rng = random.Random(seed)
+        self.verbose = True
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.population_size = 100 if torch.cuda.is_available() else 20
         self.max_parallel = mp.cpu_count()
         
         self.population = []
+        self.population_metrics = None  # (len(population), len(FITNESS_METRICS)) when the source reports metrics
         self.generation = 0
         self.best_fitness = 0.0
         self.best_framework = None
         self.running = False
         self.paused = False
         self.throttle = 100
+        self.strategy = "evolution"
+        self.generation_delay = 0.01
+        self.frozen_parameters = {}  # gene name -> fixed value (e.g. from sensitivity analysis)
+
+        # Budget tracking (used by benchmarks to compare strategies)
+        self.evaluations = 0
+        self.started_at = None
+        self.history = []  # (evaluations, elapsed_seconds, best_fitness) per generation
         
         self.stats = {
             "generation": 0,
             "best_fitness": 0.0,
+            "evaluations": 0,
+            "strategy": self.strategy,
             "population_size": self.population_size,
             "device": str(self.device)
         }
     
-    async def start(self):
-        """Start the REAL evolution loop with C# game integration"""
+    async def start(self, max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None):
+        """Start the REAL evolution loop with C# game integration
+
+        Runs until stop() is called, or until the optional evaluation /
+        wall-clock budget is used up.
+        """
         if self.running:
             return  # Already running
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy '{self.strategy}' (choose from {', '.join(self.STRATEGIES)})")
 
         self.running = True
-        print("🧬 Starting GPU-accelerated evolution with real C# game logic...")
+        self.started_at = time.perf_counter()
+        self._log("🧬 Starting GPU-accelerated evolution with real C# game logic...")
 
         # Initialize population if empty
         if not self.population:
-            print(f"🌱 Seeding initial population ({self.population_size} candidates)...")
-            candidates = self.generate_random_candidates(self.population_size)
-            fitnesses = await self.evaluate_candidates_parallel(candidates)
-            self.population = list(zip(candidates, fitnesses))
-            self.population.sort(key=lambda x: x[1], reverse=True)
-
-            if self.population:
-                self.best_framework, self.best_fitness = self.population[0]
-                print(f"✅ Initial best: {self.best_fitness:.2f}")
+            await self._seed_population()
 
         # Evolution loop
         while self.running:
+            if self._budget_exhausted(max_evaluations, max_seconds):
+                self.stop()
+                break
+
             if self.paused:
                 await asyncio.sleep(0.1)
                 continue
 
-            self.generation += 1
-
-            # Generate offspring via mutation (GPU-accelerated)
-            num_offspring = max(10, self.population_size // 2)
-            parents = [c for c, f in self.population[:num_offspring]]
-            offspring = self.mutate_candidates(parents)
-
-            # Evaluate using REAL C# game
-            offspring_fitnesses = await self.evaluate_candidates_parallel(offspring)
+            # Population is cleared when parameters get frozen mid-run
+            if not self.population:
+                await self._seed_population()
+                continue
 
-            # Combine and select best
-            all_candidates = self.population + list(zip(offspring, offspring_fitnesses))
-            all_candidates.sort(key=lambda x: x[1], reverse=True)
-            self.population = all_candidates[:self.population_size]
+            self.generation += 1
+            await self.STRATEGIES[self.strategy](self)
+            if not self.population:
+                continue  # Everything was outside a freeze applied mid-generation; reseed
 
-            # Update best
-            current_best_framework, current_best_fitness = self.population[0]
+            # Update best (NSGA-II orders by Pareto rank, so don't assume index 0)
+            current_best_framework, current_best_fitness = max(self.population, key=lambda x: x[1])
             if current_best_fitness > self.best_fitness:
                 self.best_fitness = current_best_fitness
                 self.best_framework = current_best_framework
-                print(f"Gen {self.generation}: NEW BEST! Fitness = {self.best_fitness:.2f}")
+                self._log(f"Gen {self.generation}: NEW BEST! Fitness = {self.best_fitness:.2f}")
+            self._record_history()
 
             # Update stats
             avg_fit = sum(f for c, f in self.population) / len(self.population)
@@ -136,10 +229,143 @@ class GPUEvolutionEngine:
                 "generation": self.generation,
                 "best_fitness": self.best_fitness,
                 "avg_fitness": avg_fit,
+                "evaluations": self.evaluations,
+                "strategy": self.strategy,
+                "pareto_front_size": len(self.get_pareto_front()),
                 "running": True
             })
 
-            await asyncio.sleep(0.01)  # Small delay for responsiveness
+            await asyncio.sleep(self.generation_delay)  # Small delay for responsiveness
+
+    async def _seed_population(self):
+        self._log(f"🌱 Seeding initial population ({self.population_size} candidates)...")
+        candidates = self.generate_random_candidates(self.population_size)
+        fitnesses, metrics = await self._evaluate(candidates)
+        self._survive(*self._combine(candidates, fitnesses, metrics), order_by="fitness")
+
+        if self.population:
+            self.best_framework, self.best_fitness = max(self.population, key=lambda x: x[1])
+            self._record_history()
+            self._log(f"✅ Initial best: {self.best_fitness:.2f}")
+
+    async def _step_evolution(self):
+        """One generation of truncation selection + mutation"""
+        # Generate offspring via mutation (GPU-accelerated)
+        num_offspring = max(10, self.population_size // 2)
+        parents = [c for c, f in self.population[:num_offspring]]
+        offspring = self.mutate_candidates(parents)
+
+        # Evaluate using REAL C# game
+        offspring_fitnesses, offspring_metrics = await self._evaluate(offspring)
+
+        # Combine and select best
+        self._survive(*self._combine(offspring, offspring_fitnesses, offspring_metrics), order_by="fitness")
+
+    async def _step_random_search(self):
+        """Baseline: a fresh random batch each generation, keep the best seen"""
+        candidates = self.generate_random_candidates(self.population_size)
+        fitnesses, metrics = await self._evaluate(candidates)
+
+        self._survive(*self._combine(candidates, fitnesses, metrics), order_by="fitness")
+
+    async def _step_nsga2(self):
+        """One NSGA-II generation over the per-metric scores (no scalar weighting)"""
+        if self.population_metrics is None:
+            self.stop()
+            raise ValueError("NSGA-II needs per-metric scores; fitness source only returned scalar fitness")
+
+        # Binary tournament on (Pareto rank, crowding distance)
+        ranks, crowding = rank_and_crowding(self.population_metrics)
+        parents = []
+        for _ in range(self.population_size):
+            a = self.rng.randrange(len(self.population))
+            b = self.rng.randrange(len(self.population))
+            if ranks[b] < ranks[a] or (ranks[b] == ranks[a] and crowding[b] > crowding[a]):
+                a = b
+            parents.append(self.population[a][0])
+        offspring = self.mutate_candidates(parents)
+
+        offspring_fitnesses, offspring_metrics = await self._evaluate(offspring)
+
+        # Elitist survival: fill by fronts, last front by crowding distance
+        self._survive(*self._combine(offspring, offspring_fitnesses, offspring_metrics), order_by="pareto")
+
+    # Search strategies selectable via self.strategy (one generation per call)
+    STRATEGIES = {
+        "evolution": _step_evolution,
+        "random_search": _step_random_search,
+        "nsga2": _step_nsga2,
+    }
+    # Strategies that need per-metric scores from the fitness source
+    MULTI_OBJECTIVE_STRATEGIES = {"nsga2"}
+
+    def _combine(self, candidates: List[FrameworkCandidate], fitnesses: List[float],
+                 metrics: Optional[np.ndarray]) -> Tuple[List[FrameworkCandidate], np.ndarray, Optional[np.ndarray]]:
+        """Current population + newly evaluated candidates as parallel candidates / fitness / metrics"""
+        all_candidates = [c for c, f in self.population] + list(candidates)
+        all_fitnesses = np.array([f for c, f in self.population] + list(fitnesses), dtype=float)
+        # Metrics only survive when every row has them (a swapped-in source can mix kinds)
+        all_metrics = None
+        if metrics is not None:
+            if self.population_metrics is not None:
+                all_metrics = np.vstack([self.population_metrics, metrics])
+            elif not self.population:
+                all_metrics = metrics
+        return all_candidates, all_fitnesses, all_metrics
+
+    def _survive(self, candidates: List[FrameworkCandidate], fitnesses: np.ndarray,
+                 metrics: Optional[np.ndarray], order_by: str):
+        """Keep the best population_size, by scalar fitness or by NSGA-II Pareto order"""
+        if self.frozen_parameters:
+            # Offspring bred before a mid-run freeze may come back violating it
+            keep = [i for i, c in enumerate(candidates)
+                    if all(getattr(c, name) == value for name, value in self.frozen_parameters.items())]
+            if len(keep) < len(candidates):
+                candidates = [candidates[i] for i in keep]
+                fitnesses = fitnesses[keep]
+                metrics = metrics[keep] if metrics is not None else None
+
+        if order_by == "pareto":
+            order = survivor_order(metrics)
+        else:
+            order = np.argsort(-fitnesses, kind='stable')
+        order = order[:self.population_size]
+        self.population = [(candidates[i], float(fitnesses[i])) for i in order]
+        self.population_metrics = metrics[order] if metrics is not None else None
+
+    def get_pareto_front(self) -> List[Dict]:
+        """Non-dominated candidates of the current population (empty for scalar-only sources)"""
+        if self.population_metrics is None or not self.population:
+            return []
+        ranks = non_dominated_sort(self.population_metrics)
+        front = []
+        for i in np.nonzero(ranks == 0)[0]:
+            candidate, fitness = self.population[i]
+            front.append({
+                "candidate": vars(candidate).copy(),
+                "metrics": dict(zip(FITNESS_METRICS, self.population_metrics[i].tolist())),
+                "fitness": fitness,
+            })
+        return front
+
+    def _budget_exhausted(self, max_evaluations: Optional[int], max_seconds: Optional[float]) -> bool:
+        if max_evaluations is not None and self.evaluations >= max_evaluations:
+            return True
+        if max_seconds is not None and self.elapsed() >= max_seconds:
+            return True
+        return False
+
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return time.perf_counter() - self.started_at
+
+    def _record_history(self):
+        self.history.append((self.evaluations, self.elapsed(), self.best_fitness))
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
 
     def get_stats(self) -> Dict:
         return self.stats.copy()
@@ -159,49 +385,77 @@ class GPUEvolutionEngine:
 
     def generate_random_candidates(self, n: int) -> List[FrameworkCandidate]:
         """Generate N random candidates using GPU"""
-        import random
         candidates = []
         for i in range(n):
-            candidates.append(FrameworkCandidate(
-                base_hp=random.randint(15, 40),
-                hp_per_level=random.uniform(1.0, 5.0),
-                base_str=random.randint(2, 5),
-                base_def=random.randint(0, 3),
-                stat_points_per_level=random.randint(1, 3),
-                enemy_base_hp=random.randint(3, 12),
-                enemy_hp_scaling=random.uniform(0.5, 3.0),
-                enemy_base_damage=random.randint(1, 5),
-                enemy_damage_scaling=random.uniform(0.1, 1.0),
-                base_gold=random.randint(8, 20),
-                gold_scaling=random.uniform(2.0, 6.0),
-                equipment_drop_rate=random.uniform(10.0, 40.0)
-            ))
+            genes = {}
+            for name, (low, high, is_int) in PARAMETER_BOUNDS.items():
+                if name in self.frozen_parameters:
+                    genes[name] = self.frozen_parameters[name]
+                else:
+                    genes[name] = self.rng.randint(low, high) if is_int else self.rng.uniform(low, high)
+            candidates.append(FrameworkCandidate(**genes))
         return candidates
 
     def mutate_candidates(self, parents: List[FrameworkCandidate]) -> List[FrameworkCandidate]:
         """Mutate parent candidates (GPU-accelerated in future)"""
-        import random
         offspring = []
         for parent in parents:
-            # Simple mutation for now
-            offspring.append(FrameworkCandidate(
-                base_hp=max(15, min(40, parent.base_hp + random.randint(-2, 2))),
-                hp_per_level=max(1.0, min(5.0, parent.hp_per_level + random.uniform(-0.5, 0.5))),
-                base_str=max(2, min(5, parent.base_str + random.randint(-1, 1))),
-                base_def=max(0, min(3, parent.base_def + random.randint(-1, 1))),
-                stat_points_per_level=max(1, min(3, parent.stat_points_per_level + random.randint(-1, 1))),
-                enemy_base_hp=max(3, min(12, parent.enemy_base_hp + random.randint(-1, 1))),
-                enemy_hp_scaling=max(0.5, min(3.0, parent.enemy_hp_scaling + random.uniform(-0.2, 0.2))),
-                enemy_base_damage=max(1, min(5, parent.enemy_base_damage + random.randint(-1, 1))),
-                enemy_damage_scaling=max(0.1, min(1.0, parent.enemy_damage_scaling + random.uniform(-0.1, 0.1))),
-                base_gold=max(8, min(20, parent.base_gold + random.randint(-1, 1))),
-                gold_scaling=max(2.0, min(6.0, parent.gold_scaling + random.uniform(-0.3, 0.3))),
-                equipment_drop_rate=max(10.0, min(40.0, parent.equipment_drop_rate + random.uniform(-2.0, 2.0)))
-            ))
+            # Simple mutation for now: bounded random step, clamped to PARAMETER_BOUNDS
+            genes = {}
+            for name, (low, high, is_int) in PARAMETER_BOUNDS.items():
+                step = MUTATION_STEPS[name]
+                delta = self.rng.randint(-step, step) if is_int else self.rng.uniform(-step, step)
+                genes[name] = max(low, min(high, getattr(parent, name) + delta))
+            offspring.append(FrameworkCandidate(**genes))
+        if self.frozen_parameters:
+            offspring = [replace(child, **self.frozen_parameters) for child in offspring]
         return offspring
 
+    def freeze_parameters(self, values: Dict[str, float]):
+        """Pin genes to fixed values so the search only explores the rest
+
+        Freezing discards the current population and best so far (they may sit
+        outside the reduced space); the next generation reseeds inside it.
+        Pass {} to unfreeze - the existing population stays valid then.
+        """
+        unknown = [name for name in values if name not in PARAMETER_BOUNDS]
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+        self.frozen_parameters = {
+            name: int(round(value)) if PARAMETER_BOUNDS[name][2] else float(value)
+            for name, value in values.items()
+        }
+        self.stats["frozen_parameters"] = list(self.frozen_parameters)
+
+        if self.frozen_parameters and self.population:
+            self.population = []
+            self.population_metrics = None
+            self.best_fitness = 0.0
+            self.best_framework = None
+            self.stats["best_fitness"] = 0.0
+
     async def evaluate_candidates_parallel(self, candidates: List[FrameworkCandidate]) -> List[float]:
-        """Evaluate candidates using REAL C# game (parallel processes)"""
-        # For now, return random fitnesses (will implement C# calls next)
-        import random
-        return [random.uniform(50, 80) for _ in candidates]
+        """Evaluate candidates with the configured fitness source (default: C# game)"""
+        fitnesses, metrics = await self._evaluate(candidates)
+        return fitnesses
+
+    async def _evaluate(self, candidates: List[FrameworkCandidate]) -> Tuple[List[float], Optional[np.ndarray]]:
+        """Scalar fitness per candidate, plus (n, len(FITNESS_METRICS)) scores if the source reports them"""
+        if self.fitness_source is None:
+            results = await self.evaluate_with_game(candidates)
+        else:
+            results = self.fitness_source(candidates)
+            if asyncio.iscoroutine(results):
+                results = await results
+        results = list(results)
+        self.evaluations += len(candidates)
+
+        if results and isinstance(results[0], dict):
+            metrics = np.array([[r[name] for name in FITNESS_METRICS] for r in results], dtype=float)
+            return scalarize_metrics(metrics).tolist(), metrics
+        return [float(f) for f in results], None
+
+    async def evaluate_with_game(self, candidates: List[FrameworkCandidate]) -> List[Dict[str, float]]:
+        """Evaluate candidates using REAL C# game (parallel processes), per-metric scores"""
+        # For now, return random scores (will implement C# calls next)
+        return [{name: self.rng.uniform(50, 80) for name in FITNESS_METRICS} for _ in candidates]
@@ -0,0 +1,73 @@
+"""
+NSGA-II building blocks, vectorized with NumPy
+- Non-dominated sorting (Pareto ranks)
+- Crowding distance within a front
+- Survivor ordering by (rank, crowding)
+
+All objectives are MAXIMIZED (fitness metrics are 0-100, higher is better).
+"""
+import numpy as np
+
+
+def dominance_matrix(scores: np.ndarray) -> np.ndarray:
+    """dominates[i, j] is True when row i Pareto-dominates row j"""
+    at_least_as_good = (scores[:, None, :] >= scores[None, :, :]).all(axis=2)
+    strictly_better = (scores[:, None, :] > scores[None, :, :]).any(axis=2)
+    return at_least_as_good & strictly_better
+
+
+def non_dominated_sort(scores: np.ndarray) -> np.ndarray:
+    """Pareto rank per row: 0 = non-dominated front, 1 = next front, ..."""
+    n = len(scores)
+    ranks = np.full(n, -1, dtype=int)
+    if n == 0:
+        return ranks
+
+    dominates = dominance_matrix(scores)
+    dominated_by = dominates.sum(axis=0)  # How many rows dominate each row
+
+    rank = 0
+    current = dominated_by == 0
+    while current.any():
+        ranks[current] = rank
+        # Peel off the current front and see who becomes non-dominated
+        dominated_by = dominated_by - dominates[current].sum(axis=0)
+        current = (dominated_by == 0) & (ranks < 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(scores: np.ndarray) -> np.ndarray:
+    """Crowding distance of each row within one front (boundary points = inf)"""
+    n, m = scores.shape
+    if n <= 2:
+        return np.full(n, np.inf)
+
+    order = np.argsort(scores, axis=0, kind='stable')
+    sorted_scores = np.take_along_axis(scores, order, axis=0)
+    span = sorted_scores[-1] - sorted_scores[0]
+    span[span == 0] = 1.0  # Flat objective contributes nothing
+
+    contribution = np.empty((n, m))
+    contribution[1:-1] = (sorted_scores[2:] - sorted_scores[:-2]) / span
+    contribution[[0, -1]] = np.inf
+
+    per_objective = np.empty((n, m))
+    np.put_along_axis(per_objective, order, contribution, axis=0)
+    return per_objective.sum(axis=1)
+
+
+def rank_and_crowding(scores: np.ndarray):
+    """Pareto ranks and per-front crowding distances for every row"""
+    ranks = non_dominated_sort(scores)
+    crowding = np.zeros(len(scores))
+    for rank in range(ranks.max() + 1 if len(ranks) else 0):
+        front = ranks == rank
+        crowding[front] = crowding_distance(scores[front])
+    return ranks, crowding
+
+
+def survivor_order(scores: np.ndarray) -> np.ndarray:
+    """Indices ordered best-first: lower rank wins, ties broken by larger crowding"""
+    ranks, crowding = rank_and_crowding(scores)
+    return np.lexsort((-crowding, ranks))
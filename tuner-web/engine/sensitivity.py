@@ -0,0 +1,240 @@
+"""
+Batched global sensitivity analysis over the 12-gene framework space
+- Sobol indices via Saltelli sampling (first-order + total-effect)
+- Morris elementary-effects screening (cheaper, ranking only)
+- Samples pushed through the engine's evaluator in large batches
+- Recommends low-impact parameters to freeze (GPUEvolutionEngine.freeze_parameters)
+
+Usage (from tuner-web/):
+    python3 -m engine.sensitivity --method sobol --samples 256
+    python3 -m engine.sensitivity --method morris --samples 50 --landscape replay:replay.json
+"""
+import argparse
+import asyncio
+import json
+import numpy as np
+from typing import Dict, Optional
+
+from engine.gpu_evolution import GPUEvolutionEngine, PARAMETER_BOUNDS, unit_to_candidates
+
+
+# ===== Sample matrices (unit hypercube) =====
+
+def saltelli_matrices(samples: int, rng: np.random.Generator):
+    """A, B and the k AB_i matrices (AB_i = A with column i taken from B)"""
+    k = len(PARAMETER_BOUNDS)
+    a = rng.random((samples, k))
+    b = rng.random((samples, k))
+    ab = np.repeat(a[None, :, :], k, axis=0)
+    ab[np.arange(k), :, np.arange(k)] = b.T
+    return a, b, ab
+
+
+def morris_trajectories(trajectories: int, rng: np.random.Generator, levels: int = 4):
+    """One-at-a-time trajectories: (r, k+1, k) points, plus the gene moved at each step and its delta"""
+    k = len(PARAMETER_BOUNDS)
+    delta = levels / (2.0 * (levels - 1))
+    # Base points on the lower half of the grid so +delta stays inside [0, 1]
+    base = rng.integers(0, levels // 2, (trajectories, k)) / (levels - 1)
+    orders = np.argsort(rng.random((trajectories, k)), axis=1)
+    signs = np.where(rng.random((trajectories, k)) < 0.5, 1.0, -1.0)
+
+    points = np.repeat(base[:, None, :], k + 1, axis=1)
+    start = np.where(signs > 0, base, base + delta)  # Downward steps start from the top
+    points[:, 0, :] = start
+    steps = np.zeros((trajectories, k))
+    for step in range(k):
+        gene = orders[:, step]
+        rows = np.arange(trajectories)
+        points[:, step + 1, :] = points[:, step, :]
+        points[rows, step + 1, gene] += signs[rows, gene] * delta
+        steps[:, step] = signs[rows, gene] * delta
+    return points, orders, steps
+
+
+# ===== Indices =====
+
+def sobol_indices(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray,
+                  rng: np.random.Generator, resamples: int = 100) -> Dict[str, np.ndarray]:
+    """Saltelli (2010) first-order and Jansen total-effect estimators, with bootstrap 95% CI"""
+    def estimate(fa, fb, fab):
+        variance = np.var(np.concatenate([fa, fb], axis=-1), axis=-1)
+        variance = np.where(variance > 0, variance, np.inf)  # Flat landscape -> all indices 0
+        first = np.mean(fb * (fab - fa), axis=-1) / variance
+        total = 0.5 * np.mean((fa - fab) ** 2, axis=-1) / variance
+        return first, total
+
+    first, total = estimate(f_a, f_b, f_ab)
+
+    n = len(f_a)
+    index = rng.integers(0, n, (resamples, n))
+    boot_first, boot_total = estimate(f_a[index], f_b[index], f_ab[:, index])
+    return {
+        "first_order": first,
+        "total_effect": total,
+        "first_order_conf": 1.96 * np.std(boot_first, axis=1),
+        "total_effect_conf": 1.96 * np.std(boot_total, axis=1),
+    }
+
+
+def morris_indices(fitnesses: np.ndarray, orders: np.ndarray, steps: np.ndarray) -> Dict[str, np.ndarray]:
+    """mu* (mean |elementary effect|) and sigma per gene from (r, k+1) trajectory fitnesses"""
+    effects = np.empty_like(steps)
+    rows = np.arange(len(fitnesses))[:, None]
+    effects[rows, orders] = np.diff(fitnesses, axis=1) / steps
+    return {
+        "mu_star": np.mean(np.abs(effects), axis=0),
+        "mu": np.mean(effects, axis=0),
+        "sigma": np.std(effects, axis=0),
+    }
+
+
+# ===== Job =====
+
+class SensitivityAnalysis:
+    """Sensitivity-analysis job, run next to evolution against the same evaluator"""
+
+    METHODS = ("sobol", "morris")
+
+    def __init__(self, engine: GPUEvolutionEngine, method: str = "sobol", samples: int = 256,
+                 batch_size: int = 512, freeze_threshold: float = 0.05, seed: Optional[int] = None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method '{method}' (choose from {', '.join(self.METHODS)})")
+        if samples < 1:
+            raise ValueError("Need at least one sample")
+        self.engine = engine
+        self.method = method
+        self.samples = samples  # Sobol: base samples N; Morris: trajectories r
+        self.batch_size = batch_size
+        self.freeze_threshold = freeze_threshold
+        self.rng = np.random.default_rng(seed)
+
+        k = len(PARAMETER_BOUNDS)
+        self.total_evaluations = samples * (k + 2) if method == "sobol" else samples * (k + 1)
+        self.running = False
+        self.result = None
+        self.task = None  # asyncio.Task when started in the background (API)
+        self.stats = {
+            "method": method,
+            "samples": samples,
+            "evaluated": 0,
+            "total_evaluations": self.total_evaluations,
+            "running": False,
+            "error": None
+        }
+
+    async def run(self) -> Optional[Dict]:
+        """Generate the sample matrix, evaluate it in batches, compute indices
+
+        Failures are recorded in stats["error"] (result stays None) so
+        background jobs can report them.
+        """
+        self.running = True
+        self.stats["running"] = True
+        try:
+            if self.method == "sobol":
+                a, b, ab = saltelli_matrices(self.samples, self.rng)
+                points = np.vstack([a, b, ab.reshape(-1, a.shape[1])])
+                fitnesses = await self._evaluate_batched(points)
+                n = self.samples
+                indices = sobol_indices(fitnesses[:n], fitnesses[n:2 * n],
+                                        fitnesses[2 * n:].reshape(-1, n), self.rng)
+                importance = indices["total_effect"]
+            else:
+                trajectories, orders, steps = morris_trajectories(self.samples, self.rng)
+                points = trajectories.reshape(-1, trajectories.shape[2])
+                fitnesses = await self._evaluate_batched(points)
+                indices = morris_indices(fitnesses.reshape(trajectories.shape[:2]), orders, steps)
+                # mu* is in fitness units, so rank relative to the most influential gene
+                top = indices["mu_star"].max()
+                importance = indices["mu_star"] / top if top > 0 else np.zeros_like(indices["mu_star"])
+
+            self.result = self._build_result(points, fitnesses, indices, importance)
+            return self.result
+        except Exception as e:
+            self.stats["error"] = f"{type(e).__name__}: {e}"
+            print(f"⚠️  Sensitivity analysis failed: {self.stats['error']}")
+            return None
+        finally:
+            self.running = False
+            self.stats["running"] = False
+
+    async def _evaluate_batched(self, points: np.ndarray) -> np.ndarray:
+        fitnesses = []
+        for start in range(0, len(points), self.batch_size):
+            candidates = unit_to_candidates(points[start:start + self.batch_size])
+            fitnesses.extend(await self.engine.evaluate_candidates_parallel(candidates))
+            self.stats["evaluated"] = len(fitnesses)
+            await asyncio.sleep(0)  # Keep the API responsive between batches
+        return np.array(fitnesses, dtype=float)
+
+    def _build_result(self, points: np.ndarray, fitnesses: np.ndarray,
+                      indices: Dict[str, np.ndarray], importance: np.ndarray) -> Dict:
+        names = list(PARAMETER_BOUNDS)
+        keep = [name for name, score in zip(names, importance) if score >= self.freeze_threshold]
+
+        # Freeze the rest at their value in the best sample seen
+        best = int(np.argmax(fitnesses))
+        best_genes = vars(unit_to_candidates(points[best])[0])
+        freeze = {name: best_genes[name] for name in names if name not in keep}
+
+        return {
+            "method": self.method,
+            "samples": self.samples,
+            "evaluations": len(fitnesses),
+            "freeze_threshold": self.freeze_threshold,
+            "parameters": {
+                name: {key: float(values[i]) for key, values in indices.items()}
+                for i, name in enumerate(names)
+            },
+            "importance": dict(zip(names, importance.tolist())),
+            "keep": keep,
+            "freeze": freeze,
+            "best_fitness": float(fitnesses[best]),
+        }
+
+    def get_stats(self) -> Dict:
+        return self.stats.copy()
+
+
+def print_report(result: Dict):
+    print(f"\n🔬 {result['method']} sensitivity ({result['evaluations']} evaluations)")
+    ranked = sorted(result["importance"].items(), key=lambda x: x[1], reverse=True)
+    for name, score in ranked:
+        marker = "keep  " if name in result["keep"] else "freeze"
+        print(f"   {marker} {name:<24}{score:>8.3f}")
+    print(f"\n❄️  Freeze {len(result['freeze'])}/{len(PARAMETER_BOUNDS)} parameters: {result['freeze']}")
+
+
+def main():
+    from engine.benchmark import build_sources
+
+    parser = argparse.ArgumentParser(description="Global sensitivity analysis over framework parameters")
+    parser.add_argument("--method", choices=SensitivityAnalysis.METHODS, default="sobol")
+    parser.add_argument("--samples", type=int, default=256,
+                        help="Sobol base samples N (N*14 evals) or Morris trajectories r (r*13 evals)")
+    parser.add_argument("--batch-size", type=int, default=512, help="Candidates per evaluator batch")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Freeze parameters below this importance")
+    parser.add_argument("--landscape", default=None,
+                        help="Synthetic landscape or replay:<table.json> instead of the real evaluator")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write full result as JSON")
+    args = parser.parse_args()
+
+    source = build_sources([args.landscape], None)[0] if args.landscape else None
+    engine = GPUEvolutionEngine(fitness_source=source, seed=args.seed)
+    job = SensitivityAnalysis(engine, method=args.method, samples=args.samples,
+                              batch_size=args.batch_size, freeze_threshold=args.threshold, seed=args.seed)
+    result = asyncio.run(job.run())
+    if result is None:
+        raise SystemExit(1)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Result written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()